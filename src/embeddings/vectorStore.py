@@ -1,51 +1,340 @@
-from langchain_community.vectorstores import Chroma
 from langchain_community.embeddings import HuggingFaceEmbeddings
-from typing import List, Dict
+from langchain_core.documents import Document
+from typing import List, Dict, Tuple
+import functools
+import itertools
 import os
+import pickle
 
-def get_vectorstore(persist_dir: str = "chroma_db") -> Chroma:
+import numpy as np
+
+try:
+    import faiss
+except ImportError:
+    faiss = None  # brute-force NumPy/SimSIMD fallback below
+
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Files written inside persist_dir
+INDEX_FILE = "tax.faiss"
+DOCS_FILE = "docs.pkl"
+EMB_FILE = "emb.f16"
+
+# How many chunks to pull from the ingest pipeline per encode batch
+ENCODE_BATCH_SIZE = 1024
+
+def get_embedding_device() -> str:
     """
-    Load existing vector store with HuggingFace embeddings.
+    Pick the best available device for the embedding model.
+    Override with TAXRAG_DEVICE (e.g. 'cpu', 'cuda', 'mps') if needed.
+    Run Docker with --gpus all to make CUDA visible inside the container.
     """
-    embeddings = HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2",
-        model_kwargs={'device': 'cpu'},
-        encode_kwargs={'normalize_embeddings': True}
-    )
+    override = os.environ.get("TAXRAG_DEVICE")
+    if override:
+        return override
 
-    return Chroma(
-        persist_directory=persist_dir,
-        embedding_function=embeddings
-    )
+    import torch
+    if torch.cuda.is_available():
+        return "cuda"
+    if getattr(torch.backends, "mps", None) and torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+class ONNXEmbeddings:
+    """
+    CPU embedder backed by fastembed's int8-quantized ONNX export of
+    the MiniLM model - 2-4x faster than the PyTorch forward pass on CPU
+    with negligible retrieval quality loss. Exposes the same
+    embed_documents / embed_query interface Chroma expects, returning
+    normalized vectors like our HuggingFaceEmbeddings config.
+    """
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL):
+        from fastembed import TextEmbedding
+        self.model_name = model_name
+        self.client = TextEmbedding(model_name=model_name)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [vec.tolist() for vec in self.client.embed(texts, batch_size=128)]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
 
-def create_vectorstore(chunks: List[Dict], persist_dir: str = "/app/chroma_db") -> Chroma:
-    print(f"  Creating embeddings for {len(chunks)} chunks...")
+
+@functools.lru_cache(maxsize=4)
+def _get_embeddings(model_name: str, device: str):
+    """
+    Shared embedding model instance.
+    Memoized so the MCP server, FastAPI startup, and ingest all reuse
+    one loaded model instead of each reloading it from disk.
+
+    On CPU, prefers the quantized ONNX path (fastembed) when installed.
+    Set TAXRAG_ONNX=0 to force the PyTorch model.
+    """
+    if device == 'cpu' and os.environ.get('TAXRAG_ONNX', '1') != '0':
+        try:
+            # fastembed's ONNX export is already graph-optimized
+            return ONNXEmbeddings(model_name)
+        except ImportError:
+            pass  # fastembed not installed - use the PyTorch model
 
     embeddings = HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2",
-        model_kwargs={'device': 'cpu'},
+        model_name=model_name,
+        model_kwargs={'device': device},
         encode_kwargs={'normalize_embeddings': True}
     )
 
-    texts = [chunk["content"] for chunk in chunks]
-    metadatas = [chunk["metadata"] for chunk in chunks]
+    # Fuse the transformer graph (LayerNorm+GELU+matmul) - roughly 2x
+    # on CPU and ~1.3x on GPU for short sequences. First encode after
+    # this triggers compilation, which the startup warmup absorbs.
+    # Set TAXRAG_COMPILE=0 to skip.
+    if os.environ.get('TAXRAG_COMPILE', '1') != '0':
+        try:
+            import torch
+            transformer = embeddings.client._first_module()
+            transformer.auto_model = torch.compile(
+                transformer.auto_model, mode='reduce-overhead'
+            )
+        except Exception as e:
+            print(f"torch.compile not applied ({e}); using eager model")
 
-    vectorstore = Chroma.from_texts(
-        texts=texts,
-        embedding=embeddings,
-        metadatas=metadatas,
-        persist_directory=persist_dir
-    )
+    return embeddings
+
+
+def _encode_texts(embeddings, texts: List[str]) -> List[List[float]]:
+    """
+    Batch-encode texts, returning vectors aligned with the input order.
+
+    Texts are sorted by length first so each mini-batch pads to roughly
+    its own longest text, not the corpus maximum (SBERT "smart
+    batching") - big win on padded-token throughput.
+    """
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    sorted_texts = [texts[i] for i in order]
+
+    if isinstance(embeddings, ONNXEmbeddings):
+        sorted_vectors = embeddings.embed_documents(sorted_texts)
+    else:
+        sorted_vectors = [
+            vec.tolist() for vec in embeddings.client.encode(
+                sorted_texts,
+                batch_size=128,
+                show_progress_bar=True,
+                normalize_embeddings=True
+            )
+        ]
+
+    # Unsort so vectors line up with texts/metadatas again
+    vectors = [None] * len(texts)
+    for i, vec in zip(order, sorted_vectors):
+        vectors[i] = vec
+    return vectors
+
+
+def _inner_product_scores(query_vec: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    Inner products of one query against a matrix of normalized vectors
+    (== cosine similarity). Uses SimSIMD's AVX kernels when installed,
+    else falls back to BLAS matmul.
+    """
+    if simsimd is not None:
+        # simsimd rejects mixed dtypes, and a reloaded store's matrix
+        # is the float16 memmap - match the query to it (no copy when
+        # the dtypes already agree, i.e. the fresh-build float32 case)
+        distances = np.asarray(
+            simsimd.cdist(query_vec.astype(matrix.dtype, copy=False)[None, :],
+                          matrix, metric="cosine")
+        )[0]
+        return 1.0 - distances.astype(np.float32)
+    return matrix @ query_vec
 
-    print(f"  Persisting vector store to {persist_dir}...")
-    vectorstore.persist()
 
-    return vectorstore
+class FaissVectorStore:
+    """
+    Exact inner-product search over the chunk embeddings.
+
+    Title 26 is a static corpus, so a flat FAISS index (brute-force
+    SIMD matmul) gives exact results in single-digit ms at this scale
+    with none of Chroma's persistence/HNSW overhead. Mirrors the part
+    of the Chroma interface the retrieval layer uses
+    (similarity_search_with_score / similarity_search), so search() and
+    initialize_bm25 work unchanged. When faiss itself is not installed,
+    searches fall back to a NumPy/SimSIMD scan over the stored matrix -
+    same exact results, still vectorized.
+    """
+
+    def __init__(self, index, matrix: np.ndarray, texts: List[str],
+                 metadatas: List[Dict], embedding_function,
+                 persist_dir: str = None):
+        self.index = index
+        self.matrix = matrix
+        self.texts = texts
+        self.metadatas = metadatas
+        self.persist_dir = persist_dir
+        self._embedding_function = embedding_function
+
+        # Stamp each chunk's row index into its metadata so retrieval
+        # layers can merge/dedup results by a stable integer id
+        for i, meta in enumerate(self.metadatas):
+            meta["doc_id"] = i
+
+    @classmethod
+    def load(cls, persist_dir: str, embedding_function) -> "FaissVectorStore":
+        with open(os.path.join(persist_dir, DOCS_FILE), "rb") as f:
+            docs = pickle.load(f)
+
+        # Zero-copy, demand-paged view of the embedding matrix - cold
+        # start does no bulk read, pages fault in as they are touched
+        matrix = np.memmap(
+            os.path.join(persist_dir, EMB_FILE),
+            dtype=np.float16,
+            mode="r",
+            shape=(len(docs["texts"]), docs["dim"])
+        )
+
+        index = None
+        index_path = os.path.join(persist_dir, INDEX_FILE)
+        if faiss is not None and os.path.exists(index_path):
+            index = faiss.read_index(index_path)
+
+        return cls(index, matrix, docs["texts"], docs["metadatas"],
+                   embedding_function, persist_dir=persist_dir)
+
+    @classmethod
+    def build(cls, vectors: List[List[float]], texts: List[str],
+              metadatas: List[Dict], embedding_function,
+              persist_dir: str) -> "FaissVectorStore":
+        matrix = np.asarray(vectors, dtype=np.float32)
+
+        index = None
+        os.makedirs(persist_dir, exist_ok=True)
+        if faiss is not None:
+            index = faiss.IndexFlatIP(matrix.shape[1])
+            index.add(matrix)
+            faiss.write_index(index, os.path.join(persist_dir, INDEX_FILE))
+
+        # Persist the matrix as a float16 memmap: half the disk/RSS of
+        # fp32 with no measurable retrieval loss for normalized MiniLM
+        # vectors, and the fallback scan mmaps it back zero-copy
+        emb = np.memmap(
+            os.path.join(persist_dir, EMB_FILE),
+            dtype=np.float16,
+            mode="w+",
+            shape=matrix.shape
+        )
+        emb[:] = matrix
+        emb.flush()
+
+        with open(os.path.join(persist_dir, DOCS_FILE), "wb") as f:
+            pickle.dump(
+                {"texts": texts, "metadatas": metadatas,
+                 "dim": matrix.shape[1]}, f
+            )
+
+        return cls(index, matrix, texts, metadatas, embedding_function,
+                   persist_dir=persist_dir)
+
+    def similarity_search_with_score(self, query: str,
+                                     k: int = 4) -> List[Tuple[Document, float]]:
+        """
+        Returns (Document, distance) pairs like Chroma did, where
+        distance = 1 - inner product (cosine distance for our
+        normalized vectors), so downstream scoring is unchanged.
+        """
+        return self.similarity_search_by_vector_with_score(
+            self._embedding_function.embed_query(query), k=k
+        )
+
+    def similarity_search_by_vector_with_score(
+            self, embedding, k: int = 4) -> List[Tuple[Document, float]]:
+        """
+        Same as similarity_search_with_score but takes an already
+        computed query embedding (e.g. from the HTTP query batcher).
+        """
+        query_vec = np.asarray(embedding, dtype=np.float32)
+        k = min(k, len(self.texts))
+
+        if self.index is not None:
+            similarities, indices = self.index.search(query_vec[None, :], k)
+            pairs = zip(similarities[0], indices[0])
+        else:
+            scores = _inner_product_scores(query_vec, self.matrix)
+            # argpartition selects the top k in O(n); only those k then
+            # need ordering, instead of sorting every score
+            top = np.argpartition(-scores, min(k, scores.size - 1))[:k]
+            top = top[np.argsort(-scores[top])]
+            pairs = zip(scores[top], top)
+
+        results = []
+        for sim, idx in pairs:
+            if idx < 0:
+                continue
+            doc = Document(
+                page_content=self.texts[idx],
+                metadata=self.metadatas[idx]
+            )
+            results.append((doc, 1.0 - float(sim)))
+        return results
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k)]
+
+
+def get_vectorstore(persist_dir: str = "chroma_db") -> FaissVectorStore:
+    """
+    Load existing vector store with HuggingFace embeddings.
+    """
+    embeddings = _get_embeddings(EMBEDDING_MODEL, get_embedding_device())
+
+    return FaissVectorStore.load(persist_dir, embeddings)
+
+def _iter_batches(iterable, size: int):
+    """Yield lists of up to `size` items from any iterable."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def create_vectorstore(chunks, persist_dir: str = "/app/chroma_db") -> FaissVectorStore:
+    """
+    Build the vector store from an iterable of chunk dicts.
+    Chunks are consumed in streaming mini-batches, so when fed a
+    generator the upstream parse/chunk work overlaps with encoding and
+    peak memory stays at one batch of texts rather than the whole
+    corpus of chunk dicts.
+    """
+    print("  Creating embeddings (streaming batches)...")
+
+    embeddings = _get_embeddings(EMBEDDING_MODEL, get_embedding_device())
+
+    texts = []
+    metadatas = []
+    vectors = []
+    for batch in _iter_batches(chunks, ENCODE_BATCH_SIZE):
+        batch_texts = [chunk["content"] for chunk in batch]
+        vectors.extend(_encode_texts(embeddings, batch_texts))
+        texts.extend(batch_texts)
+        metadatas.extend(chunk["metadata"] for chunk in batch)
+        print(f"    encoded {len(texts)} chunks...", flush=True)
+
+    print(f"  Persisting vector store to {persist_dir}...")
+    return FaissVectorStore.build(vectors, texts, metadatas, embeddings, persist_dir)
 
 
 def vectorstore_exists(persist_dir: str = "/app/chroma_db") -> bool:
-    return (
-        os.path.exists(persist_dir)
-        and os.path.isdir(persist_dir)
-        and len(os.listdir(persist_dir)) > 0
-    )
+    # scandir stops at the first entry - os.listdir would materialize
+    # the whole directory just to test non-emptiness
+    try:
+        with os.scandir(persist_dir) as entries:
+            return next(entries, None) is not None
+    except (FileNotFoundError, NotADirectoryError):
+        return False
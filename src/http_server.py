@@ -7,6 +7,8 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from typing import List, Optional
+import asyncio
+import functools
 import sys
 import os
 import uvicorn
@@ -16,6 +18,61 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from embeddings.vectorStore import get_vectorstore
 from retrieval.search import search, initialize_bm25
 
+
+class QueryBatcher:
+    """
+    Coalesces concurrent query embeddings into one model forward pass.
+
+    Requests arriving within the batching window (or until the batch
+    fills) are embedded together, so under load the model runs once per
+    batch instead of once per request. Single-threaded with respect to
+    the event loop, so no locking is needed; the actual encode runs in
+    the default thread pool to keep the loop free.
+    """
+
+    def __init__(self, embed_batch, window_s: float = 0.01, max_batch: int = 32):
+        self._embed_batch = embed_batch
+        self._window_s = window_s
+        self._max_batch = max_batch
+        self._queue = []
+        self._timer = None
+
+    async def embed(self, text: str):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((text, future))
+
+        if len(self._queue) >= self._max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window_s, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._queue = self._queue, []
+        if batch:
+            asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch):
+        loop = asyncio.get_running_loop()
+        texts = [text for text, _ in batch]
+        try:
+            vectors = await loop.run_in_executor(None, self._embed_batch, texts)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
 # Initialize FastAPI
 app = FastAPI(
     title="Tax Code Search API",
@@ -39,8 +96,26 @@ print(" Starting Tax Code Search API...")
 db = get_vectorstore("chroma_db")
 print(" Initializing hybrid search...")
 initialize_bm25(db)
+query_batcher = QueryBatcher(db._embedding_function.embed_documents)
+# Warm up the embedding model so the first real request doesn't pay
+# model-to-device transfer / torch.compile cost; two encodes lets the
+# compiled graph settle
+print(" Warming up embedding model...")
+for _ in range(2):
+    db._embedding_function.embed_query("warmup")
 print(" ===== API Ready! =====")
 
+
+async def _run_search(query: str, top_k: int, alpha: float) -> List[dict]:
+    """Embed via the batcher, then run the hybrid search off-loop."""
+    query_embedding = await query_batcher.embed(query)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None,
+        functools.partial(search, db, query, k=top_k, alpha=alpha,
+                          query_embedding=query_embedding)
+    )
+
 # Request/Response models
 class SearchRequest(BaseModel):
     query: str = Field(..., description="Search query", example="SALT deduction limit")
@@ -120,7 +195,7 @@ def examples():
     }
 
 @app.post("/search", response_model=SearchResponse)
-def search_endpoint(request: SearchRequest):
+async def search_endpoint(request: SearchRequest):
     """
     Search the tax code
     
@@ -138,8 +213,8 @@ def search_endpoint(request: SearchRequest):
     - 1.0: Pure semantic search (good for concepts)
     """
     try:
-        results = search(db, request.query, k=request.top_k, alpha=request.alpha)
-        
+        results = await _run_search(request.query, request.top_k, request.alpha)
+
         formatted_results = [
             SearchResult(
                 text=r['text'],
@@ -160,15 +235,15 @@ def search_endpoint(request: SearchRequest):
         raise HTTPException(status_code=500, detail=f"Search error: {str(e)}")
 
 @app.get("/search/{query}")
-def search_get(query: str, top_k: int = 5, alpha: float = 0.5):
+async def search_get(query: str, top_k: int = 5, alpha: float = 0.5):
     """
     Search via GET request (convenience method)
-    
+
     Example: /search/SALT%20deduction?top_k=3
     """
     try:
-        results = search(db, query, k=top_k, alpha=alpha)
-        
+        results = await _run_search(query, top_k, alpha)
+
         formatted_results = [
             SearchResult(
                 text=r['text'],
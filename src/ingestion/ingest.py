@@ -44,44 +44,38 @@ def ingest_tax_code(
     
     docs = load_pdf(pdf_path)
     print(f"  ✓ Loaded {len(docs)} pages")
-    
-    # Step 2: Parse into sections
-    print("\n[2/4] Parsing sections...")
+
+    # Steps 2+3: parse and chunk lazily. Both are generators, so pages
+    # stream through parsing and chunking straight into the encoder in
+    # mini-batches instead of materializing each stage as a full list -
+    # halves peak memory and overlaps CPU parsing with encoding.
+    print("\n[2/4] Parsing sections (streamed)...")
     sections = parse_documents(docs)
-    print(f"  ✓ Parsed {len(sections)} sections")
-    
-    # Print sample sections
-    print("\n  Sample sections:")
-    for sec in sections[:5]:
-        header = sec['header'][:80] + "..." if len(sec['header']) > 80 else sec['header']
-        print(f"    - {header} (page {sec['page']})")
-    
-    # Step 3: Chunk sections
-    print("\n[3/4] Chunking sections...")
+
+    print("\n[3/4] Chunking sections (streamed)...")
     chunks = chunk_sections(sections)
-    print(f"  ✓ Created {len(chunks)} chunks")
-    
-    # Print chunk statistics
-    avg_length = sum(len(c["content"]) for c in chunks) / len(chunks) if chunks else 0
-    print(f"  ✓ Average chunk length: {avg_length:.0f} characters")
-    
+
     # Step 4: Create vector store
     print("\n[4/4] Creating vector store...")
     print("  (This may take several minutes - downloading embeddings model...)")
-    
+
     try:
         vectorstore = create_vectorstore(chunks, persist_dir)
         print(f"  ✓ Vector store created at {persist_dir}")
     except Exception as e:
         print(f"  ✗ Error creating vector store: {e}")
         raise
-    
+
+    # Chunk statistics (from the built store - chunks were streamed)
+    total_chunks = len(vectorstore.texts)
+    avg_length = sum(len(t) for t in vectorstore.texts) / total_chunks if total_chunks else 0
+
     # Verify
     print("\n" + "=" * 80)
     print("INGESTION COMPLETE!")
     print("=" * 80)
-    print(f"Total chunks indexed: {len(chunks)}")
-    print(f"Total sections: {len(sections)}")
+    print(f"Total chunks indexed: {total_chunks}")
+    print(f"Average chunk length: {avg_length:.0f} characters")
     print(f"Vector store location: {persist_dir}")
     print("\nYou can now run queries using the search module.")
     print("Test with: python test_search.py")
@@ -1,24 +1,22 @@
 import re
-from typing import List, Dict
+from typing import List, Dict, Iterator
 
-# Multiple patterns to catch different section formats in tax code
-SECTION_PATTERNS = [
-    re.compile(r"(§\s*\d+[A-Za-z\-]*\.?\s+[A-Z][^\n§]+)", re.MULTILINE),  # § 164. State taxes
-    re.compile(r"(Sec\.\s*\d+[A-Za-z\-]*\.?\s+[A-Z][^\n]+)", re.MULTILINE),  # Sec. 164. State taxes
-    re.compile(r"(Section\s+\d+[A-Za-z\-]*\.?\s+[A-Z][^\n]+)", re.MULTILINE)  # Section 164
-]
+# Single alternation covering the section formats in the tax code:
+# "§ 164. State taxes", "Sec. 164. State taxes", "Section 164. ..."
+# One compiled pattern means one scan per page instead of up to three.
+SECTION_PATTERN = re.compile(
+    r"(§\s*\d+[A-Za-z\-]*\.?\s+[A-Z][^\n§]+"
+    r"|Sec\.\s*\d+[A-Za-z\-]*\.?\s+[A-Z][^\n]+"
+    r"|Section\s+\d+[A-Za-z\-]*\.?\s+[A-Z][^\n]+)",
+    re.MULTILINE
+)
 
 def split_by_section(text: str, page_num: int = None) -> List[Dict]:
     """
     Split text into sections based on tax code section headers.
     Returns list of dicts with header, text, and page metadata.
     """
-    # Try each pattern until we find matches
-    matches = []
-    for pattern in SECTION_PATTERNS:
-        matches = list(pattern.finditer(text))
-        if matches:
-            break
+    matches = list(SECTION_PATTERN.finditer(text))
     
     if not matches:
         # No sections found - return entire text as one section
@@ -48,38 +46,46 @@ def split_by_section(text: str, page_num: int = None) -> List[Dict]:
     return sections
 
 
-def parse_documents(docs: List) -> List[Dict]:
+def parse_documents(docs) -> Iterator[Dict]:
     """
-    Parse documents into sections.
-    Handles case where sections span multiple pages.
-    
+    Parse documents into sections, yielding one section at a time.
+
+    Sections that continue onto the next page(s) arrive as consecutive
+    same-header fragments (docs are page-ordered), so we merge a run of
+    equal headers into one section and emit it as soon as a different
+    header appears. Streaming means downstream chunking/embedding can
+    start before the whole document is parsed, and no full section list
+    is ever held in memory.
+
     Args:
-        docs: List of Document objects from langchain with page_content and metadata
-        
-    Returns:
-        List of section dicts with header, text, and page
+        docs: Iterable of Document objects from langchain with
+              page_content and metadata
+
+    Yields:
+        Section dicts with header, text, and page
     """
-    all_sections = []
-    
+    pending = None
+    fragments = []  # text pieces of the pending section, joined on emit
+
+    def _flush():
+        # Join once at emit time - repeated "+=" on the pending text
+        # would re-allocate the whole string per page for big sections
+        pending["text"] = "\n".join(fragments)
+        return pending
+
     for doc in docs:
         page_num = doc.metadata.get("page", 1)
-        page_text = doc.page_content
-        
-        sections = split_by_section(page_text, page_num)
-        all_sections.extend(sections)
-    
-    # Merge sections with same header (spanning multiple pages)
-    merged_sections = {}
-    for section in all_sections:
-        header = section["header"]
-        if header in merged_sections:
-            # Append text, keep earliest page number
-            merged_sections[header]["text"] += "\n" + section["text"]
-            merged_sections[header]["page"] = min(
-                merged_sections[header]["page"], 
-                section["page"]
-            )
-        else:
-            merged_sections[header] = section
-    
-    return list(merged_sections.values())
\ No newline at end of file
+
+        for section in split_by_section(doc.page_content, page_num):
+            if pending is not None and section["header"] == pending["header"]:
+                # Same section continuing - collect text, keep earliest page
+                fragments.append(section["text"])
+                pending["page"] = min(pending["page"], section["page"])
+            else:
+                if pending is not None:
+                    yield _flush()
+                pending = section
+                fragments = [section["text"]]
+
+    if pending is not None:
+        yield _flush()
\ No newline at end of file
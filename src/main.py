@@ -30,6 +30,12 @@ try:
     from retrieval.search import initialize_bm25
     initialize_bm25(vector_store)
     print("✓ Hybrid search initialized", file=sys.stderr)
+
+    # Warm up the embedding model so the first tool call doesn't pay
+    # model-to-device transfer / torch.compile cost
+    for _ in range(2):
+        vector_store._embedding_function.embed_query("warmup")
+    print("✓ Embedding model warmed up", file=sys.stderr)
 except Exception as e:
     print(f"✗ Error loading vector store: {e}", file=sys.stderr)
     sys.exit(1)
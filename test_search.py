@@ -6,9 +6,45 @@ Test the search functionality
 import sys
 sys.path.append('src')
 
-from embeddings.vectorStore import get_vectorstore
+from embeddings.vectorStore import FaissVectorStore, get_vectorstore
 from retrieval.search import search
 
+
+def test_reload_roundtrip():
+    """Build a tiny store, reload it from disk, and search it.
+
+    A reloaded store serves its matrix as a float16 memmap, unlike the
+    float32 matrix a fresh build holds, so this exercises the dtype
+    handling of the fallback scan (including the simsimd kernel when
+    installed) that otherwise only fires after a process restart.
+    """
+    import tempfile
+
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(8, 16)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    texts = [f"chunk {i}" for i in range(len(vectors))]
+    metadatas = [{"section": f"§ {i}", "page": i} for i in range(len(vectors))]
+
+    with tempfile.TemporaryDirectory() as persist_dir:
+        FaissVectorStore.build(vectors.tolist(), texts, metadatas,
+                               embedding_function=None,
+                               persist_dir=persist_dir)
+        db = FaissVectorStore.load(persist_dir, embedding_function=None)
+        db.index = None  # force the fp16-matrix fallback scan
+
+        # Each vector should retrieve itself first
+        for i in (0, len(vectors) - 1):
+            results = db.similarity_search_by_vector_with_score(vectors[i], k=3)
+            top_doc, distance = results[0]
+            assert top_doc.metadata["doc_id"] == i, top_doc.metadata
+            assert distance < 0.01, distance
+
+    print("✓ Reload round-trip search OK (fp16 fallback-scan path)")
+
+
 def test_search():
     """Test search with example queries"""
     
@@ -47,4 +83,5 @@ def test_search():
         print("\n")
 
 if __name__ == "__main__":
+    test_reload_roundtrip()
     test_search()
\ No newline at end of file